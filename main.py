@@ -2,10 +2,11 @@ from __future__ import annotations
 
 import logging
 
-from src import app
+from src import app, compact_book
 
 log = logging.getLogger()
 log.setLevel(logging.DEBUG)
 
 if __name__ == "__main__":
+    compact_book()
     app.run()
@@ -1,2 +1,2 @@
-from .address import MISSING, Address, AddressDict  # noqa
+from .address import ADDRESS_FIELDS, MISSING, Address, AddressDict  # noqa
 from .book import AddressBook, AddressBookDict  # noqa
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import doctest
-from typing import Any, TypedDict
+import itertools
+from dataclasses import InitVar, dataclass, field
+from typing import Any, Callable, ClassVar, TypedDict
+
+from typing_extensions import NotRequired
 
 
 class _MissingSentinel:
@@ -9,19 +13,32 @@ class _MissingSentinel:
     A sentinel class representing a missing value.
 
     This class is used to indicate a missing value in certain contexts.
-    It overrides the equality, boolean, and hash methods to always return False or 0.
+    It is a singleton that is always falsy and only equal to itself;
+    use ``is MISSING`` / ``is not MISSING`` to check for it.
+
+    >>> _MissingSentinel() is MISSING
+    True
+    >>> MISSING == MISSING, MISSING == None
+    (True, False)
     """
 
     __slots__ = ()
 
+    _instance: _MissingSentinel | None = None
+
+    def __new__(cls) -> _MissingSentinel:
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
     def __eq__(self, other) -> bool:
-        return False
+        return self is other
 
     def __bool__(self) -> bool:
         return False
 
     def __hash__(self) -> int:
-        return 0
+        return object.__hash__(self)
 
     def __repr__(self):
         return "..."
@@ -39,98 +56,104 @@ class AddressDict(TypedDict):
     city: str | None
     state: str | None
     postal_code: str | None
+    id: NotRequired[int]
+
 
+# Address fields in display order, shared by the form handling and serializers
+ADDRESS_FIELDS = (
+    "recipient_name",
+    "organization_name",
+    "building_number",
+    "street_name",
+    "apartment_number",
+    "city",
+    "state",
+    "postal_code",
+)
+_EDITABLE = frozenset(ADDRESS_FIELDS)
 
+
+@dataclass(slots=True, kw_only=True, eq=False, repr=False)
 class Address:
-    def __init__(
-        self,
-        *,
-        recipient_name: str,
-        organization_name: str | None = None,
-        building_number: str | None = None,
-        street_name: str | None = None,
-        apartment_number: str | None = None,
-        city: str | None = None,
-        state: str | None = None,
-        postal_code: str | None = None,
-        **kwargs,
-    ) -> None:
-        """Address class to represent a physical address
+    """Address class to represent a physical address
 
-        >>> address = Address(recipient_name="John Doe", building_number="123", street_name="Main St")
-        >>> address
-        <Address recipient_name=John Doe>
-        >>> address.building_number
-        '123'
-        """
-        self.recipient_name: str = recipient_name
-        self.organization_name = organization_name
-        self.building_number = building_number
-        self.street_name = street_name
-        self.apartment_number = apartment_number
-        self.city = city
-        self.state = state
-        self.postal_code = postal_code
+    >>> address = Address(recipient_name="John Doe", building_number="123", street_name="Main St")
+    >>> address
+    <Address recipient_name=John Doe>
+    >>> address.building_number
+    '123'
+    """
+
+    recipient_name: str
+    organization_name: str | None = None
+    building_number: str | None = None
+    street_name: str | None = None
+    apartment_number: str | None = None
+    city: str | None = None
+    state: str | None = None
+    postal_code: str | None = None
+    address_id: InitVar[int | None] = None
+
+    _address_id: int = field(init=False, compare=False)
+
+    _id_counter: ClassVar[itertools.count] = itertools.count(1)
+
+    def __post_init__(self, address_id: int | None) -> None:
+        self._assign_id(address_id)
+
+    def _assign_id(self, address_id: int | None, *, reserve: bool = True) -> None:
+        if address_id is None:
+            address_id = next(Address._id_counter)
+        elif reserve:
+            Address._reserve_id(address_id)
+        self._address_id = address_id
+
+    @staticmethod
+    def _reserve_id(address_id: int) -> None:
+        # Restored ids must never be handed out again to new addresses
+        Address._id_counter = itertools.count(
+            max(address_id + 1, next(Address._id_counter))
+        )
 
     @property
     def id(self) -> str:
-        return "0" + str(hash(self))
-
-    def __str__(self) -> str:
-        address = ""
-        if self.recipient_name:
-            address += f"{self.recipient_name}\n"
-        if self.organization_name:
-            address += f"{self.organization_name}\n"
-        if self.building_number:
-            address += f"{self.building_number} "
-        if self.street_name:
-            address += f"{self.street_name}\n"
-        if self.apartment_number:
-            address += f"{self.apartment_number}\n"
-        if self.city:
-            address += f"{self.city}, "
-        if self.state:
-            address += f"{self.state} "
-        if self.postal_code:
-            address += f"{self.postal_code}\n"
-        return address
+        """
+        >>> address = Address(recipient_name="John Doe", address_id=42)
+        >>> address.id
+        '42'
+        >>> int(Address(recipient_name="Jane Doe").id) > 42
+        True
+        """
+        return str(self._address_id)
 
     def __repr__(self) -> str:
         return "<Address recipient_name=%s>" % self.recipient_name
 
-    def __eq__(self, other: Address) -> bool:
+    def __eq__(self, other: object) -> bool:
         """
         >>> addr1 = Address(recipient_name="Ritik")
         >>> addr2 = Address(recipient_name="Ritik")
         >>> addr1 == addr2
         True
+        >>> addr1 == "Ritik"
+        False
         """
-        return all(
-            [
-                self.recipient_name == other.recipient_name,
-                self.organization_name == other.organization_name,
-                self.building_number == other.building_number,
-                self.street_name == other.street_name,
-                self.apartment_number == other.apartment_number,
-                self.city == other.city,
-                self.state == other.state,
-                self.postal_code == other.postal_code,
-            ]
+        if self is other:
+            return True
+        if type(other) is not Address:
+            return NotImplemented
+        return (
+            self.recipient_name == other.recipient_name
+            and self.postal_code == other.postal_code
+            and self.street_name == other.street_name
+            and self.building_number == other.building_number
+            and self.apartment_number == other.apartment_number
+            and self.organization_name == other.organization_name
+            and self.city == other.city
+            and self.state == other.state
         )
 
-    def edit(
-        self,
-        *,
-        recipient_name: str = MISSING,
-        organization_name: str | None = MISSING,
-        building_number: str | None = MISSING,
-        street_name: str | None = MISSING,
-        apartment_number: str | None = MISSING,
-        city: str | None = MISSING,
-        state: str | None = MISSING,
-        postal_code: str | None = MISSING,
-    ) -> Address:
+    def edit(self, **fields: str | None) -> Address:
         """
         >>> address = Address(recipient_name="John Doe", building_number="123", street_name="Main St")
         >>> address
@@ -141,30 +164,17 @@ class Address:
         <Address recipient_name=John Doe>
         >>> address.building_number
         '456'
+        >>> address.edit(country="India")
+        Traceback (most recent call last):
+            ...
+        TypeError: unexpected fields: country
         """
-        if recipient_name is not MISSING:
-            self.recipient_name = recipient_name
+        unexpected = fields.keys() - _EDITABLE
+        if unexpected:
+            raise TypeError(f"unexpected fields: {', '.join(sorted(unexpected))}")
 
-        if organization_name is not MISSING:
-            self.organization_name = organization_name
-
-        if building_number is not MISSING:
-            self.building_number = building_number
-
-        if street_name is not MISSING:
-            self.street_name = street_name
-
-        if apartment_number is not MISSING:
-            self.apartment_number = apartment_number
-
-        if city is not MISSING:
-            self.city = city
-
-        if state is not MISSING:
-            self.state = state
-
-        if postal_code is not MISSING:
-            self.postal_code = postal_code
+        for name, value in fields.items():
+            setattr(self, name, value)
 
         return self
 
@@ -184,8 +194,8 @@ class Address:
         """Returns the address as a JSON serializable dictionary
 
         >>> address = Address(recipient_name="John Doe", building_number="123", street_name="Main St")
-        >>> address.json()
-        {'recipient_name': 'John Doe', 'organization_name': None, 'building_number': '123', 'street_name': 'Main St', 'apartment_number': None, 'city': None, 'state': None, 'postal_code': None}
+        >>> address.json()  # doctest: +ELLIPSIS
+        {'recipient_name': 'John Doe', 'organization_name': None, 'building_number': '123', 'street_name': 'Main St', 'apartment_number': None, 'city': None, 'state': None, 'postal_code': None, 'id': ...}
         """
         return {
             "recipient_name": self.recipient_name,
@@ -196,6 +206,7 @@ class Address:
             "city": self.city or None,
             "state": self.state or None,
             "postal_code": self.postal_code or None,
+            "id": self._address_id,
         }
 
     @staticmethod
@@ -206,18 +217,38 @@ class Address:
         >>> address
         <Address recipient_name=John Doe>
         """
-
         return Address(
-            recipient_name=json.get("recipient_name"),
-            organization_name=json.get("organization_name"),
-            building_number=json.get("building_number"),
-            street_name=json.get("street_name"),
-            apartment_number=json.get("apartment_number"),
-            city=json.get("city"),
-            state=json.get("state"),
-            postal_code=json.get("postal_code"),
+            **{name: json.get(name) for name in ADDRESS_FIELDS},
+            address_id=json.get("id"),
         )
 
+    @classmethod
+    def _from_raw(cls, data: AddressDict) -> Address:
+        """Builds an Address straight from a loaded record, skipping ``__init__``
+
+        A persisted id is taken as-is; bulk loaders reserve the highest one once
+        with ``Address._reserve_id`` instead of once per record.
+
+        >>> address = Address._from_raw({'recipient_name': 'John Doe', 'street_name': 'Main St', 'id': 7})
+        >>> address, address.street_name, address.city, address.id
+        (<Address recipient_name=John Doe>, 'Main St', None, '7')
+        >>> Address._from_raw({'city': 'Delhi'})
+        Traceback (most recent call last):
+            ...
+        KeyError: 'recipient_name'
+        """
+        address = object.__new__(cls)
+        address.recipient_name = data["recipient_name"]
+        address.organization_name = data.get("organization_name")
+        address.building_number = data.get("building_number")
+        address.street_name = data.get("street_name")
+        address.apartment_number = data.get("apartment_number")
+        address.city = data.get("city")
+        address.state = data.get("state")
+        address.postal_code = data.get("postal_code")
+        address._assign_id(data.get("id"), reserve=False)
+        return address
+
     @classmethod
     def from_address(cls, address: Address) -> Address:
         """Returns a new Address object from an existing Address object
@@ -227,27 +258,28 @@ class Address:
         >>> new_address
         <Address recipient_name=John Doe>
         """
-        return cls(
-            recipient_name=address.recipient_name,
-            organization_name=address.organization_name,
-            building_number=address.building_number,
-            street_name=address.street_name,
-            apartment_number=address.apartment_number,
-            city=address.city,
-            state=address.state,
-            postal_code=address.postal_code,
-        )
+        return cls(**{name: getattr(address, name) for name in ADDRESS_FIELDS})
 
     def to_dict(self) -> AddressDict:
         """Returns the address as a JSON serializable dictionary
 
         >>> address = Address(recipient_name="John Doe", building_number="123", street_name="Main St")
-        >>> address.to_dict()
-        {'recipient_name': 'John Doe', 'organization_name': None, 'building_number': '123', 'street_name': 'Main St', 'apartment_number': None, 'city': None, 'state': None, 'postal_code': None}
+        >>> address.to_dict()  # doctest: +ELLIPSIS
+        {'recipient_name': 'John Doe', 'organization_name': None, 'building_number': '123', 'street_name': 'Main St', 'apartment_number': None, 'city': None, 'state': None, 'postal_code': None, 'id': ...}
         """
         return self.json()
 
     def __hash__(self) -> int:
+        """
+        >>> hash(Address(recipient_name="Ritik", postal_code="110001")) == hash(Address(recipient_name="Ritik", postal_code="110001"))
+        True
+        >>> address = Address(recipient_name="Ritik", city="Delhi")
+        >>> address.city = "Mumbai"
+        >>> hash(address) == hash(Address(recipient_name="Ritik", city="Mumbai"))
+        True
+        """
+        # Not memoized: the fields are public and can be reassigned directly,
+        # so a cached value would break the hash/eq contract
         return hash(
             (
                 self.recipient_name,
@@ -262,5 +294,29 @@ class Address:
         )
 
 
+# (field, separator) pairs rendered by ``Address.__str__``, in order
+_STR_LAYOUT = tuple(zip(ADDRESS_FIELDS, ("\n", "\n", " ", "\n", "\n", ", ", " ", "\n")))
+
+
+def _compile_str() -> Callable[[Address], str]:
+    """Generates ``Address.__str__`` as one ``str.join`` over a fixed tuple of fragments
+
+    >>> address = Address(recipient_name="John Doe", building_number="123", street_name="Main St", city="Springfield")
+    >>> str(address)
+    'John Doe\\n123 Main St\\nSpringfield, '
+    """
+    fragments = "".join(
+        f"        (f'{{self.{field}}}' {separator!r}) if self.{field} else '',\n"
+        for field, separator in _STR_LAYOUT
+    )
+    source = f"def __str__(self):\n    return ''.join((\n{fragments}    ))\n"
+    namespace: dict[str, Any] = {}
+    exec(source, namespace)
+    return namespace["__str__"]
+
+
+Address.__str__ = _compile_str()
+
+
 if __name__ == "__main__":
     doctest.testmod()
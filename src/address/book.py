@@ -1,22 +1,27 @@
 from __future__ import annotations
 
 import doctest
+import itertools
 import json
 import logging
 import os
 import pathlib
-from typing import Any, TypedDict
+from operator import attrgetter
+from typing import Any, Iterable, TypedDict
 
 from .address import MISSING, Address, AddressDict, _MissingSentinel
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 log = logging.getLogger(__name__)
 
+_RNAME = attrgetter("recipient_name")
 
-class JsonEncoder(json.JSONEncoder):
-    def default(self, other: _MissingSentinel | Any) -> Any:
-        if isinstance(other, _MissingSentinel):
-            return None
-        return super().default(other)
+# Size at which the append-only log is folded back into the address book file
+_LOG_COMPACT_BYTES = 1 << 20
 
 
 class AddressBookDict(TypedDict):
@@ -37,7 +42,8 @@ class AddressBook:
         """
         self.__book_holder_name: str = MISSING
         self.__book_holder_id: int = MISSING
-        self.__addresses: set[Address] = set()
+        self.__addresses: dict[int, Address] = {}
+        self.__sorted_cache: list[Address] | None = None
 
     @property
     def book_holder_name(self) -> str:
@@ -58,12 +64,50 @@ class AddressBook:
         self.__book_holder_id = id
 
     def add_address(self, address: Address) -> None:
-        log.info("adding address %s to address book", address)
-        self.__addresses.add(address)
+        """Adds an address, keyed by its id; equal addresses with different ids are both kept
+
+        >>> address_book = AddressBook()
+        >>> address_book.add_address(Address(recipient_name="Ritik"))
+        >>> address_book.add_address(Address(recipient_name="Ritik"))
+        >>> len(address_book)
+        2
+        """
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("adding address %s to address book", address)
+        self._index(address)
 
     def remove_address(self, address: Address) -> None:
-        log.info("removing address %s from address book", address)
-        self.__addresses.remove(address)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("removing address %s from address book", address)
+        self._unindex(address)
+
+    def _bulk_add(self, addresses: Iterable[Address]) -> None:
+        index = self._index
+        for address in addresses:
+            index(address)
+
+    def _index(self, address: Address) -> None:
+        self.__addresses[address._address_id] = address
+        self.__sorted_cache = None
+
+    def _unindex(self, address: Address) -> None:
+        self.__addresses.pop(address._address_id, None)
+        self.__sorted_cache = None
+
+    def get_by_id(self, address_id: str) -> Address | None:
+        """
+        >>> address_book = AddressBook()
+        >>> address = Address(recipient_name="Ritik")
+        >>> address_book.add_address(address)
+        >>> address_book.get_by_id(address.id)
+        <Address recipient_name=Ritik>
+        >>> address_book.get_by_id("0")
+        >>> address_book.get_by_id("not-an-id")
+        """
+        try:
+            return self.__addresses.get(int(address_id))
+        except ValueError:
+            return None
 
     def __repr__(self) -> str:
         return f"<AddressBook name={self.__book_holder_name} total_addresses={len(self.__addresses)}>"
@@ -80,16 +124,44 @@ class AddressBook:
         return len(self.__addresses)
 
     def __iter__(self):
-        return iter(self.__addresses)
+        return iter(self.__addresses.values())
 
     def __contains__(self, address: Address) -> bool:
-        return address in self.__addresses
+        """Membership is by address id, not by content
+
+        >>> address_book = AddressBook()
+        >>> address = Address(recipient_name="Ritik")
+        >>> address_book.add_address(address)
+        >>> address in address_book, Address(recipient_name="Ritik") in address_book
+        (True, False)
+        """
+        return address._address_id in self.__addresses
 
     def __getitem__(self, index: int) -> Address:
-        return sorted(list(self.__addresses), key=lambda x: x.recipient_name)[index]
+        """
+        >>> address_book = AddressBook()
+        >>> address_book.add_address(Address(recipient_name="Ritik"))
+        >>> address_book.add_address(Address(recipient_name="John Doe"))
+        >>> address_book[0]
+        <Address recipient_name=John Doe>
+        >>> address_book[-1]
+        <Address recipient_name=Ritik>
+        >>> address = address_book[0].edit(recipient_name="Zoe")
+        >>> address_book[0]
+        <Address recipient_name=Ritik>
+        """
+        return self._sorted_addresses()[index]
 
     def __setitem__(self, index: int, address: Address) -> None:
-        self.__addresses.add(address)
+        self._index(address)
+
+    def _sorted_addresses(self) -> list[Address]:
+        cache = self.__sorted_cache
+        # Address.edit() can rename an address behind the book's back, so the
+        # cached view is only reused while it is still in order
+        if cache is None or not _is_sorted(cache):
+            cache = self.__sorted_cache = sorted(self.__addresses.values(), key=_RNAME)
+        return cache
 
     def to_dict(self) -> AddressBookDict:
         """
@@ -97,16 +169,25 @@ class AddressBook:
         >>> address_book.book_holder_name = "John Doe"
         >>> address_book.book_holder_id = 1
         >>> address_book.add_address(Address(recipient_name="Ritik"))
-        >>> address_book.to_dict()
-        {'name': 'John Doe', 'id': 1, 'addresses': [{'recipient_name': 'Ritik', 'organization_name': None, 'building_number': None, 'street_name': None, 'apartment_number': None, 'city': None, 'state': None, 'postal_code': None}]}
+        >>> address_book.to_dict()  # doctest: +ELLIPSIS
+        {'name': 'John Doe', 'id': 1, 'addresses': [{'recipient_name': 'Ritik', 'organization_name': None, 'building_number': None, 'street_name': None, 'apartment_number': None, 'city': None, 'state': None, 'postal_code': None, 'id': ...}]}
+        >>> address = Address(recipient_name="John Doe")
+        >>> address_book.add_address(address)
+        >>> address_book.remove_address(address_book[1])
+        >>> [address["recipient_name"] for address in address_book.to_dict()["addresses"]]
+        ['John Doe']
+        >>> address = address_book[0].edit(city="Mumbai")
+        >>> address_book.to_dict()["addresses"][0]["city"]
+        'Mumbai'
         """
+        name, id = self.__book_holder_name, self.__book_holder_id
         return {
-            "name": self.__book_holder_name,
-            "id": self.__book_holder_id,
-            "addresses": [address.to_dict() for address in self.__addresses],
+            "name": None if isinstance(name, _MissingSentinel) else name,
+            "id": None if isinstance(id, _MissingSentinel) else id,
+            "addresses": [address.to_dict() for address in self.__addresses.values()],
         }
 
-    def to_file(self, file_path: str | None = None) -> None:
+    def to_file(self, file_path: str | os.PathLike[str] | None = None) -> None:
         """
         >>> address_book = AddressBook()
         >>> address_book.book_holder_name = "John Doe"
@@ -114,41 +195,144 @@ class AddressBook:
         >>> address_book.add_address(Address(recipient_name="Ritik"))
         >>> address_book.to_file()
         """
-        if file_path is None:
-            path = pathlib.Path(__file__).parent / "address_book.json"
-        else:
-            path = pathlib.Path(file_path)
+        path = _resolve_path(file_path)
+
+        if orjson is not None:
+            path.write_bytes(orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2))
+            return
 
         with open(path, "w+") as file:
-            json.dump(self.to_dict(), file, indent=4, cls=JsonEncoder)
+            json.dump(self.to_dict(), file, separators=(",", ":"))
+
+    def append_address_to_log(
+        self, address: Address, file_path: str | os.PathLike[str] | None = None
+    ) -> None:
+        """Records an added address in the append-only log next to the address book file"""
+        self._log_record(file_path, address.to_dict())
+
+    def append_removal_to_log(
+        self, address: Address, file_path: str | os.PathLike[str] | None = None
+    ) -> None:
+        """Records a tombstone for a removed address in the append-only log"""
+        self._log_record(file_path, {"id": address._address_id, "deleted": True})
+
+    def _log_record(
+        self, file_path: str | os.PathLike[str] | None, record: dict[str, Any]
+    ) -> None:
+        # Keep the log, and the replay on every startup, bounded regardless of
+        # how the app is served
+        path = _resolve_path(file_path)
+        if _append_to_log(path, record) > _LOG_COMPACT_BYTES:
+            self.compact(path)
+
+    def compact(self, file_path: str | os.PathLike[str] | None = None) -> None:
+        """Folds the append-only log into the address book file and removes the log
+
+        Does nothing when there is no log, so an unchanged book is never rewritten.
+
+        >>> import tempfile
+        >>> path = pathlib.Path(tempfile.mkdtemp()) / "book.json"
+        >>> address_book = AddressBook()
+        >>> ritik, john = Address(recipient_name="Ritik"), Address(recipient_name="John Doe")
+        >>> address_book.add_address(ritik)
+        >>> address_book.to_file(path)
+        >>> address_book.add_address(john)
+        >>> address_book.append_address_to_log(john, path)
+        >>> address_book.remove_address(ritik)
+        >>> address_book.append_removal_to_log(ritik, path)
+        >>> list(AddressBook.from_file(path))
+        [<Address recipient_name=John Doe>]
+        >>> address_book.compact(path)
+        >>> path.with_suffix(".jsonl").exists()
+        False
+        >>> list(AddressBook.from_file(path))
+        [<Address recipient_name=John Doe>]
+        >>> address_book.compact(path)
+        """
+        path = _resolve_path(file_path)
+        log_path = path.with_suffix(".jsonl")
+        if not os.path.exists(log_path):
+            return
+
+        self.to_file(path)
+        log_path.unlink()
+
+    def _replay_log(self, log_path: pathlib.Path) -> None:
+        with open(log_path, "rb") as file:
+            records = [_loads(line) for line in file if line.strip()]
+
+        _reserve_ids(records)
+        for record in records:
+            if record.get("deleted"):
+                address = self.__addresses.get(record["id"])
+                if address is not None:
+                    self._unindex(address)
+            else:
+                self._index(Address._from_raw(record))
 
     @classmethod
-    def from_file(cls, file_path: str | None = None) -> AddressBook:
+    def from_file(cls, file_path: str | os.PathLike[str] | None = None) -> AddressBook:
         """
         >>> AddressBook.from_file(None)
         """
-        if file_path is None:
-            path = pathlib.Path(__file__).parent / "address_book.json"
-        else:
-            path = pathlib.Path(file_path)
+        path = _resolve_path(file_path)
+        log_path = path.with_suffix(".jsonl")
 
-        if not os.path.exists(path):
-            log.warning("file %s does not exist", path)
-            return cls()
+        address_book = cls()
 
-        log.debug("loading address book from %s", path)
-        with open(path, "r") as file:
-            data = json.load(file)
+        if os.path.exists(path):
+            log.debug("loading address book from %s", path)
+            data = _loads(path.read_bytes())
 
-        address_book = cls()
-        address_book.book_holder_name = data.get("name")
-        address_book.book_holder_id = data.get("id")
+            address_book.book_holder_name = data.get("name")
+            address_book.book_holder_id = data.get("id")
+
+            records = data.get("addresses", [])
+            _reserve_ids(records)
+            address_book._bulk_add(map(Address._from_raw, records))
+        else:
+            log.warning("file %s does not exist", path)
 
-        for address in data.get("addresses", []):
-            address_book.add_address(Address(**address))
+        if os.path.exists(log_path):
+            log.debug("replaying address book log %s", log_path)
+            address_book._replay_log(log_path)
 
         return address_book
 
 
+def _reserve_ids(records: list[dict[str, Any]]) -> None:
+    # One reservation for the whole batch instead of one per record
+    max_id = max((record.get("id") or 0 for record in records), default=0)
+    if max_id:
+        Address._reserve_id(max_id)
+
+
+def _is_sorted(addresses: list[Address]) -> bool:
+    return all(a <= b for a, b in itertools.pairwise(map(_RNAME, addresses)))
+
+
+def _resolve_path(file_path: str | os.PathLike[str] | None) -> pathlib.Path:
+    if file_path is None:
+        return pathlib.Path(__file__).parent / "address_book.json"
+    return pathlib.Path(file_path)
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _append_to_log(path: pathlib.Path, record: dict[str, Any]) -> int:
+    if orjson is not None:
+        line = orjson.dumps(record)
+    else:
+        line = json.dumps(record, separators=(",", ":")).encode()
+
+    with open(path.with_suffix(".jsonl"), "ab") as file:
+        file.write(line + b"\n")
+        return file.tell()
+
+
 if __name__ == "__main__":
     doctest.testmod()
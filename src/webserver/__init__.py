@@ -1,28 +1,50 @@
 from __future__ import annotations
 
+import threading
+
 from flask import Flask, redirect, render_template, url_for
 
-from src.address import Address, AddressBook, AddressDict
+from src.address import ADDRESS_FIELDS, Address, AddressBook, AddressDict
 from src.webserver.forms import AddressForm
 
 app = Flask(__name__)
 app.secret_key = "secret_key"
 
-book = AddressBook.from_file(r"src/address/address_book.json")
+BOOK_PATH = r"src/address/address_book.json"
+
+_book: AddressBook | None = None
+_book_lock = threading.Lock()
+
+
+def get_book() -> AddressBook:
+    global _book
+    if _book is None:
+        with _book_lock:
+            if _book is None:
+                _book = AddressBook.from_file(BOOK_PATH)
+    return _book
+
+
+def compact_book() -> None:
+    """Folds the append-only log left by a previous run into the address book file; call once at startup"""
+    get_book().compact(BOOK_PATH)
 
 
 @app.route("/")
 def index():
+    book = get_book()
     return render_template("index.html", address_book=book)
 
 
 @app.route("/add", methods=["GET", "POST"])
 def add():
+    book = get_book()
     form = AddressForm()
     if form.validate_on_submit():
-        data: AddressDict = form.data
-        book.add_address(Address(**data))
-        book.to_file()
+        data: AddressDict = {name: form[name].data for name in ADDRESS_FIELDS}
+        address = Address._from_raw(data)
+        book.add_address(address)
+        book.append_address_to_log(address, BOOK_PATH)
 
         return redirect(url_for("index"))
 
@@ -31,13 +53,15 @@ def add():
 
 @app.route("/delete/<address_id>", methods=["GET"])
 def delete(address_id):
-    for address in book:
-        if address.id == address_id:
-            book.remove_address(address)
-            return redirect(url_for("index"))
+    book = get_book()
+    address = book.get_by_id(address_id)
+    if address is not None:
+        book.remove_address(address)
+        book.append_removal_to_log(address, BOOK_PATH)
 
     return redirect(url_for("index"))
 
 
 if __name__ == "__main__":
+    compact_book()
     app.run()